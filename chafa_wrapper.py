@@ -4,62 +4,225 @@ PixelTerm Chafa封装模块
 统一chafa命令调用和配置
 """
 
+import functools
+import os
+import shlex
+import shutil
 import subprocess
+import sys
+import threading
+import time
 from typing import Optional, Tuple, List
-from constants import CHAFA_CMD, DEFAULT_CHAFA_ARGS
+from constants import CHAFA_CMD, DEFAULT_CHAFA_ARGS, CHAFA_FRAME_DELIMITER, CHAFA_WORKERS, TERMINAL_SIZE_TTL
+
+# Last terminal size and the time it was read
+_term_size: Optional[os.terminal_size] = None
+_term_size_time = 0.0
+
+
+def _cached_terminal_size() -> os.terminal_size:
+    """Get terminal size, re-reading it at most once per TERMINAL_SIZE_TTL"""
+    global _term_size, _term_size_time
+    now = time.monotonic()
+    if _term_size is None or now - _term_size_time > TERMINAL_SIZE_TTL:
+        _term_size = shutil.get_terminal_size()
+        _term_size_time = now
+    return _term_size
+
+
+@functools.lru_cache(maxsize=1)
+def _chafa_path() -> Optional[str]:
+    """Locate chafa on PATH once"""
+    return shutil.which(CHAFA_CMD)
 
 
 class ChafaWrapper:
     """Chafa命令封装器"""
     
+    # Fixed part of every chafa argv, built once
+    _CHAFA_BASE: Tuple[str, ...] = (CHAFA_CMD,) + tuple(DEFAULT_CHAFA_ARGS)
+    
+    # Long-lived render servers shared by all callers, one lock per slot
+    _servers: List[Optional[subprocess.Popen]] = [None] * CHAFA_WORKERS
+    _server_locks = [threading.Lock() for _ in range(CHAFA_WORKERS)]
+    
     @staticmethod
-    def build_command(filepath: str, scale: float = 1.0, size: Optional[Tuple[int, int]] = None) -> List[str]:
-        """构建chafa命令"""
-        cmd = [CHAFA_CMD] + DEFAULT_CHAFA_ARGS + [filepath]
-        
-        # 如果指定了尺寸，添加尺寸参数
+    def _render_size(scale: float = 1.0, size: Optional[Tuple[int, int]] = None) -> Tuple[int, int]:
+        """Resolve the frame size in cells for a render"""
+        # 如果指定了尺寸，直接使用
         if size:
-            width, height = size
-            cmd.extend(['--size', f'{width}x{height}'])
-        elif scale != 1.0:
+            return size
+        
+        term_width, term_height = _cached_terminal_size()
+        if scale != 1.0:
             # 如果有缩放需求但没有具体尺寸，需要计算
-            import shutil
-            term_width, term_height = shutil.get_terminal_size()
-            display_width = int(term_width * scale)
-            display_height = int(term_height * scale)
-            cmd.extend(['--size', f'{display_width}x{display_height}'])
+            return int(term_width * scale), int(term_height * scale)
         
+        # Always explicit: render servers have no tty to measure, so leave the
+        # bottom line free the way chafa's own terminal fit does
+        return term_width, max(1, term_height - 1)
+    
+    @staticmethod
+    def build_command(filepath: str, scale: float = 1.0, size: Optional[Tuple[int, int]] = None) -> List[str]:
+        """构建chafa命令"""
+        cmd = list(ChafaWrapper._CHAFA_BASE)
+        width, height = ChafaWrapper._render_size(scale, size)
+        cmd.extend(['--size', f'{width}x{height}'])
+        cmd.append(filepath)
         return cmd
     
     @staticmethod
-    def render_image(filepath: str, scale: float = 1.0, size: Optional[Tuple[int, int]] = None) -> Optional[str]:
-        """渲染图片并返回输出"""
+    def reset_terminal_size():
+        """Re-read the terminal size on the next render, called after a resize"""
+        global _term_size
+        _term_size = None
+    
+    @staticmethod
+    def _build_server_command() -> List[str]:
+        """Build the line-oriented render server command"""
+        # chafa has no stdin-driven batch mode, so a small shell loop keeps the
+        # pipes open and frames each render with a record separator. Each request
+        # is a "width height" line followed by the path on a line of its own
+        chafa = ' '.join(shlex.quote(arg) for arg in ChafaWrapper._CHAFA_BASE)
+        script = (
+            'while read -r w h && IFS= read -r f; do '
+            f'{chafa} --size "${{w}}x${{h}}" -- "$f" 2>/dev/null; '
+            f"printf '\\{CHAFA_FRAME_DELIMITER[0]:03o}'; "
+            'done'
+        )
+        return ['sh', '-c', script]
+    
+    @classmethod
+    def _ensure_server(cls, slot: int) -> bool:
+        """Spawn the render server in a slot, caller must hold the slot lock"""
+        server = cls._servers[slot]
+        if server is not None and server.poll() is None:
+            return True
         try:
-            cmd = ChafaWrapper.build_command(filepath, scale, size)
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            cls._servers[slot] = subprocess.Popen(
+                cls._build_server_command(),
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                bufsize=0
+            )
+            return True
+        except Exception:
+            cls._servers[slot] = None
+            return False
+    
+    @classmethod
+    def stop_server(cls):
+        """Stop the render servers"""
+        for slot, lock in enumerate(cls._server_locks):
+            with lock:
+                server, cls._servers[slot] = cls._servers[slot], None
+                if server is None:
+                    continue
+                try:
+                    server.stdin.close()
+                    server.wait(timeout=1)
+                except Exception:
+                    server.kill()
+    
+    @classmethod
+    def _acquire_server_slot(cls) -> Optional[int]:
+        """Lock an idle server slot, None if all are busy"""
+        for slot, lock in enumerate(cls._server_locks):
+            if lock.acquire(False):
+                return slot
+        return None
+    
+    @classmethod
+    def _render_via_server(cls, filepath: str, size: Tuple[int, int]) -> Optional[bytes]:
+        """Render image at the given size through an idle render server"""
+        slot = cls._acquire_server_slot()
+        if slot is None:
+            raise RuntimeError("render servers busy")
+        
+        try:
+            if not cls._ensure_server(slot):
+                raise RuntimeError("render server unavailable")
             
-            if result.returncode == 0:
-                return result.stdout
-            return None
+            server = cls._servers[slot]
+            try:
+                width, height = size
+                server.stdin.write(f'{width} {height}\n'.encode() + os.fsencode(filepath) + b'\n')
+                
+                # Read until the frame delimiter has arrived
+                buffer = bytearray()
+                fd = server.stdout.fileno()
+                while True:
+                    chunk = os.read(fd, 65536)
+                    if not chunk:
+                        raise EOFError("render server exited")
+                    buffer += chunk
+                    if CHAFA_FRAME_DELIMITER in chunk:
+                        break
+            except Exception:
+                # Server died, drop it so the next call respawns
+                cls._servers[slot] = None
+                server.kill()
+                raise
+        finally:
+            cls._server_locks[slot].release()
+        
+        frame = buffer[:buffer.index(CHAFA_FRAME_DELIMITER)]
+        return bytes(frame) if frame else None
+    
+    @staticmethod
+    def _render_once(filepath: str, scale: float = 1.0, size: Optional[Tuple[int, int]] = None) -> Optional[bytes]:
+        """Render image with a one-shot chafa process"""
+        cmd = ChafaWrapper.build_command(filepath, scale, size)
+        result = subprocess.run(cmd, capture_output=True)
+        
+        if result.returncode == 0:
+            return result.stdout
+        return None
+    
+    @staticmethod
+    def render_image(filepath: str, scale: float = 1.0, size: Optional[Tuple[int, int]] = None) -> Optional[bytes]:
+        """渲染图片并返回原始字节输出"""
+        try:
+            # Renders go through an idle persistent server, or a one-shot process
+            # when all of them are occupied; both get the same explicit size
+            if '\n' not in filepath:
+                try:
+                    size = ChafaWrapper._render_size(scale, size)
+                    return ChafaWrapper._render_via_server(filepath, size)
+                except Exception:
+                    pass  # Fall back to a one-shot process
+            
+            return ChafaWrapper._render_once(filepath, scale, size)
         except Exception:
             return None
     
     @staticmethod
-    def check_chafa_available() -> bool:
-        """检查chafa是否可用"""
+    def render_to_stdout(filepath: str, scale: float = 1.0, size: Optional[Tuple[int, int]] = None) -> bool:
+        """渲染图片并直接输出到终端"""
         try:
-            result = subprocess.run([CHAFA_CMD, '--version'], capture_output=True, check=True)
+            cmd = ChafaWrapper.build_command(filepath, scale, size)
+            
+            # Flush pending output so chafa's frame lands after it
+            sys.stdout.flush()
+            result = subprocess.run(cmd, stdout=sys.stdout.fileno(), stderr=subprocess.DEVNULL)
             return result.returncode == 0
-        except (subprocess.CalledProcessError, FileNotFoundError):
+        except Exception:
             return False
     
     @staticmethod
+    def check_chafa_available() -> bool:
+        """检查chafa是否可用"""
+        return _chafa_path() is not None
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=1)
     def get_chafa_version() -> Optional[str]:
         """获取chafa版本信息"""
         try:
-            result = subprocess.run([CHAFA_CMD, '--version'], capture_output=True, text=True)
+            result = subprocess.run([CHAFA_CMD, '--version'], capture_output=True)
             if result.returncode == 0:
-                return result.stdout.strip()
+                return result.stdout.decode('utf-8', errors='replace').strip()
             return None
         except Exception:
             return None
\ No newline at end of file
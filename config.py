@@ -6,55 +6,71 @@ PixelTerm 配置模块
 
 import os
 import json
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 from pathlib import Path
 from constants import DEFAULT_SCALE, SCALE_STEP, MIN_SCALE, MAX_SCALE
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# 默认配置 (点分键, 值)，每次使用时重新构建，避免共享嵌套字典
+_DEFAULTS: Tuple[Tuple[str, Any], ...] = (
+    ('display.default_scale', DEFAULT_SCALE),
+    ('display.scale_step', SCALE_STEP),
+    ('display.min_scale', MIN_SCALE),
+    ('display.max_scale', MAX_SCALE),
+    ('display.auto_fit', True),
+    ('display.preserve_aspect_ratio', True),
+    ('chafa.format', 'symbols'),
+    ('chafa.color_space', 'rgb'),
+    ('chafa.dither', 'none'),
+    ('chafa.symbols', 'block'),
+    ('interface.show_file_list', True),
+    ('interface.file_list_max_items', 10),
+    ('interface.auto_refresh', True),
+    ('interface.confirm_exit', True),
+    ('navigation.wrap_around', True),
+    ('navigation.remember_position', True),
+    ('navigation.sort_by', 'name'),  # name, size, date
+)
+
 
 class Config:
     """配置管理器"""
     
     def __init__(self):
         self.config_file = Path.home() / '.pixelterm' / 'config.json'
-        self.default_config = {
-            'display': {
-                'default_scale': DEFAULT_SCALE,
-                'scale_step': SCALE_STEP,
-                'min_scale': MIN_SCALE,
-                'max_scale': MAX_SCALE,
-                'auto_fit': True,
-                'preserve_aspect_ratio': True
-            },
-            'chafa': {
-                'format': 'symbols',
-                'color_space': 'rgb',
-                'dither': 'none',
-                'symbols': 'block'
-            },
-            'interface': {
-                'show_file_list': True,
-                'file_list_max_items': 10,
-                'auto_refresh': True,
-                'confirm_exit': True
-            },
-            'navigation': {
-                'wrap_around': True,
-                'remember_position': True,
-                'sort_by': 'name'  # name, size, date
-            }
-        }
-        self.config = self.default_config.copy()
+        self.default_config = self._build_default_config()
+        self.config = self._build_default_config()
+        self._flat: Dict[str, Any] = {}
         self.load_config()
     
+    @staticmethod
+    def _build_default_config() -> Dict[str, Any]:
+        """从默认值表构建一份独立的配置字典"""
+        config: Dict[str, Any] = {}
+        for key_path, value in _DEFAULTS:
+            section, key = key_path.split('.')
+            config.setdefault(section, {})[key] = value
+        return config
+    
     def load_config(self):
         """加载配置文件"""
         try:
             if self.config_file.exists():
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    user_config = json.load(f)
-                    self._merge_config(self.config, user_config)
+                data = self.config_file.read_bytes()
+                if orjson is not None:
+                    user_config = orjson.loads(data)
+                else:
+                    user_config = json.loads(data.decode('utf-8'))
+                self._merge_config(self.config, user_config)
         except Exception as e:
             print(f"Failed to load configuration file: {e}")
+        finally:
+            self._rebuild_flat()
     
     def save_config(self):
         """保存配置文件"""
@@ -62,8 +78,15 @@ class Config:
             # 确保配置目录存在
             self.config_file.parent.mkdir(parents=True, exist_ok=True)
             
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, indent=2, ensure_ascii=False)
+            if orjson is not None:
+                data = orjson.dumps(self.config, option=orjson.OPT_INDENT_2)
+            else:
+                data = json.dumps(self.config, indent=2, ensure_ascii=False).encode('utf-8')
+            
+            # 先写临时文件再替换，避免写入中断导致配置文件损坏
+            tmp_file = self.config_file.with_name(self.config_file.name + '.tmp')
+            tmp_file.write_bytes(data)
+            os.replace(tmp_file, self.config_file)
         except Exception as e:
             print(f"Failed to save configuration file: {e}")
     
@@ -75,18 +98,23 @@ class Config:
             else:
                 base[key] = value
     
-    def get(self, key_path: str, default: Any = None) -> Any:
-        """获取配置值"""
-        keys = key_path.split('.')
-        value = self.config
+    def _rebuild_flat(self):
+        """重建点分键值索引"""
+        flat: Dict[str, Any] = {}
         
-        for key in keys:
-            if isinstance(value, dict) and key in value:
-                value = value[key]
-            else:
-                return default
+        def walk(node: Dict[str, Any], prefix: str):
+            for key, value in node.items():
+                path = f"{prefix}{key}"
+                flat[path] = value
+                if isinstance(value, dict):
+                    walk(value, f"{path}.")
         
-        return value
+        walk(self.config, "")
+        self._flat = flat
+    
+    def get(self, key_path: str, default: Any = None) -> Any:
+        """获取配置值"""
+        return self._flat.get(key_path, default)
     
     def set(self, key_path: str, value: Any):
         """设置配置值"""
@@ -99,10 +127,12 @@ class Config:
             config = config[key]
         
         config[keys[-1]] = value
+        self._rebuild_flat()
     
     def reset_to_default(self):
         """重置为默认配置"""
-        self.config = self.default_config.copy()
+        self.config = self._build_default_config()
+        self._rebuild_flat()
     
     def get_display_config(self) -> Dict[str, Any]:
         """获取显示配置"""
@@ -3,12 +3,22 @@
 PixelTerm Constants Definition
 """
 
+import os
+
 # Supported image formats
-SUPPORTED_FORMATS = {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp', '.tiff'}
+SUPPORTED_FORMATS = frozenset({'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp', '.tiff'})
 
 # Preload configuration
 DEFAULT_PRELOAD_SIZE = 10
-PRELOAD_SLEEP_TIME = 0.05
+PRELOAD_NICE = 10  # Niceness of preload threads
+RENDER_CACHE_BUDGET = 32 * 1024 * 1024  # In-memory render cache limit
+SMALL_RENDER_LIMIT = 256 * 1024  # Renders below this size are kept in memory only
+DIR_CACHE_SIZE = 8  # Number of recent directory listings kept
+PARALLEL_SCAN_THRESHOLD = 200  # Image-named entries above which is_file checks run in parallel
+SCAN_WORKERS = 8
+SCAN_CHUNK_SIZE = 32
+TEMP_CACHE_BUDGET = 500 * 1024 * 1024  # Temporary file cache limit, oldest files evicted first
+TEMP_CACHE_COMPRESS = True  # Compress renders spilled to temporary files (lz4, else zlib)
 
 # Chafa command configuration
 CHAFA_CMD = 'chafa'
@@ -20,12 +30,21 @@ DEFAULT_CHAFA_ARGS = [
     '--margin-right', '0',
     '--work', '9'
 ]
+# Record separator written after each frame by the render server
+CHAFA_FRAME_DELIMITER = b'\x1e'
+# Parallel chafa render servers / preload workers, half the CPUs capped at 4
+CHAFA_WORKERS = max(1, min(4, (os.cpu_count() or 2) // 2))
+
+# Erase to end of line, put before each line of a cached frame so it can be drawn over the previous one
+ERASE_LINE_END = b'\x1b[K'
 
 # Display configuration
 DEFAULT_SCALE = 1.0
 SCALE_STEP = 0.1
 MIN_SCALE = 0.1
 MAX_SCALE = 3.0
+TERMINAL_SIZE_TTL = 0.5  # Seconds a cached terminal size stays valid
+IMAGE_INFO_CACHE_SIZE = 64  # Number of images whose metadata is kept for the info panel
 
 # Keyboard controls
 KEY_LEFT = '\x1b[D'
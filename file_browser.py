@@ -5,16 +5,92 @@ Handles directory browsing and image file management
 """
 
 import os
+import re
 import sys
+import bisect
+import threading
 import tempfile
 import hashlib
 import shutil
+import zlib
 from typing import List, Optional, Dict
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor
-from constants import SUPPORTED_FORMATS, DEFAULT_PRELOAD_SIZE, PRELOAD_SLEEP_TIME
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from constants import SUPPORTED_FORMATS, DEFAULT_PRELOAD_SIZE, RENDER_CACHE_BUDGET, DIR_CACHE_SIZE, CHAFA_WORKERS, PRELOAD_NICE, SMALL_RENDER_LIMIT, TEMP_CACHE_BUDGET, TEMP_CACHE_COMPRESS
+from constants import PARALLEL_SCAN_THRESHOLD, SCAN_WORKERS, SCAN_CHUNK_SIZE, ERASE_LINE_END
 from chafa_wrapper import ChafaWrapper
 
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+
+def _compress_render(data: bytes) -> bytes:
+    """Compress render for the temporary file cache, lz4 when installed, otherwise zlib"""
+    # chafa output is highly repetitive escape sequences, so even the fastest levels shrink it a lot
+    if lz4_frame is not None:
+        return lz4_frame.compress(data, compression_level=0)
+    return zlib.compress(data, 1)
+
+
+def _decompress_render(data: bytes) -> bytes:
+    """Decompress render written by _compress_render"""
+    if lz4_frame is not None:
+        return lz4_frame.decompress(data)
+    return zlib.decompress(data)
+
+
+def _is_image_name(name: str) -> bool:
+    """Check file name extension, requiring a non-empty stem like Path.suffix does"""
+    dot = name.rfind('.')
+    if dot <= 0:
+        return False
+    
+    # Most names are already lowercase, so try the exact suffix before lower()
+    ext = name[dot:]
+    return ext in SUPPORTED_FORMATS or ext.lower() in SUPPORTED_FORMATS
+
+
+def _lower_thread_priority():
+    """Lower priority of a preload thread and the chafa processes it spawns"""
+    # Only Linux applies nice() to the calling thread; elsewhere (macOS) it would
+    # deprioritize the whole process, including the UI thread and foreground renders
+    if not sys.platform.startswith('linux'):
+        return
+    try:
+        # nice() is inherited by threads and processes the thread creates,
+        # so only raise the niceness up to PRELOAD_NICE
+        current = os.nice(0)
+        if current < PRELOAD_NICE:
+            os.nice(PRELOAD_NICE - current)
+    except (AttributeError, OSError):
+        pass
+
+
+# Splits a name into alternating text and digit runs, always starting with text
+_NATURAL_SPLIT = re.compile(r'(\d+)')
+
+
+def _filter_files(entries: List[os.DirEntry]) -> List[Path]:
+    """Keep directory entries that are regular files (following symlinks)"""
+    return [Path(entry.path) for entry in entries if entry.is_file()]
+
+
+def _sort_key(img_path: Path):
+    """Natural sort key (img2 before img10), case-insensitive, ties broken by exact name"""
+    name = img_path.name
+    parts = _NATURAL_SPLIT.split(name.lower())
+    # Odd positions are digit runs, so ints and strs are never compared with each other
+    parts[1::2] = [int(part) for part in parts[1::2]]
+    return parts, name
+
 
 class FileBrowser:
     """File browser"""
@@ -22,19 +98,51 @@ class FileBrowser:
     def __init__(self):
         self.current_directory = Path.cwd()
         self.image_files: List[Path] = []
+        self._image_index: Dict[str, int] = {}  # Path string -> position in image_files
+        self._image_strs: List[str] = []  # Absolute path string of each entry in image_files
+        self._sort_keys: Optional[list] = None  # _sort_key of each entry, built when first inserting
+        
+        # Recent directory listings: path -> (mtime_ns, files, index, strs)
+        self._dir_cache: OrderedDict = OrderedDict()
         self.current_index = 0
         
-        # chafa pre-render cache - keep only current image and one before/after in memory
-        self.render_cache: Dict[Path, str] = {}
+        # chafa pre-render cache, bounded by a byte budget with least recently used eviction;
+        # large renders are also spilled to temporary files. Both caches are keyed by
+        # (path, mtime_ns, size), so an image edited on disk misses and is rendered again
+        self.render_cache: "OrderedDict[tuple, bytes]" = OrderedDict()
+        self._cache_bytes = 0
+        self._cache_budget = RENDER_CACHE_BUDGET
+        self._cache_lock = threading.Lock()
+        # Cache key per path string, stat'ed once per listing and again when switching to the image
+        self._file_keys: Dict[str, tuple] = {}
         self.preload_size = DEFAULT_PRELOAD_SIZE
         self.preload_enabled = True
         
-        # Temporary file cache directory
-        self.temp_dir = tempfile.mkdtemp(prefix="pixelterm_cache_")
+        # Temporary file cache directory, created on first write
+        self.temp_dir: Optional[str] = None
         self.file_cache_range = 10  # Store 10 images before/after to temporary files
+        self._cache_path_memo: Dict[tuple, str] = {}  # Cache key -> cache file path
+        # Files are named by path hash and survive directory changes, so bound the total size
+        self._temp_bytes = 0
+        self._temp_budget = TEMP_CACHE_BUDGET
+        self._temp_lock = threading.Lock()
+        # Dropped cache directories, removed again at exit in case a render wrote into one late
+        self._old_temp_dirs: List[str] = []
+        
+        # Pool for is_file checks in large directories, created on first use
+        self._scan_executor: Optional[ThreadPoolExecutor] = None
+        
+        # Pool for the parallel chafa renders driven by the preload thread
+        self.chafa_executor = ThreadPoolExecutor(
+            max_workers=CHAFA_WORKERS, thread_name_prefix="chafa_worker", initializer=_lower_thread_priority
+        )
         
-        # Thread pool for pre-rendering
-        self.render_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="chafa_render")
+        # One persistent preload thread, woken on navigation; a pass in progress
+        # is abandoned as soon as the current index moves
+        self._preload_lock = threading.Lock()
+        self._preload_wakeup = threading.Event()
+        self._preload_stop = False
+        self._preload_thread: Optional[threading.Thread] = None
     
     def set_directory(self, directory: str) -> bool:
         """Set current directory"""
@@ -72,25 +180,33 @@ class FileBrowser:
                 print(f"Error: Unsupported image format {filepath}")
                 return False
             
-            # Set file's directory
-            self.current_directory = path.parent
-            self.refresh_file_list()
+            # Set file's directory, reusing the current listing and caches when unchanged
+            if path.parent != self.current_directory or not self.image_files:
+                self.current_directory = path.parent
+                self.refresh_file_list()
             
             # Find current file index in list
-            for i, img_file in enumerate(self.image_files):
-                if img_file == path:
-                    self.current_index = i
-                    return True
-            
-            # If not found, add to list
-            self.image_files.append(path)
-            self.image_files.sort()
-            for i, img_file in enumerate(self.image_files):
-                if img_file == path:
-                    self.current_index = i
-                    return True
+            path_str = str(path)
+            index = self._image_index.get(path_str)
+            if index is None:
+                # If not found, insert in sorted position
+                if self._sort_keys is None:
+                    self._sort_keys = [_sort_key(img_path) for img_path in self.image_files]
+                key = _sort_key(path)
+                index = bisect.bisect_right(self._sort_keys, key)
+                self._sort_keys.insert(index, key)
+                self.image_files.insert(index, path)
+                self._rebuild_index()
+                
+                # Keep the remembered listing in step, or returning here would drop the file again
+                cached = self._dir_cache.get(self.current_directory)
+                if cached is not None:
+                    self._dir_cache[self.current_directory] = (
+                        cached[0], tuple(self.image_files), dict(self._image_index), tuple(self._image_strs)
+                    )
             
-            return False
+            self.current_index = index
+            return True
             
         except Exception as e:
             print(f"Error setting image file: {e}")
@@ -98,173 +214,409 @@ class FileBrowser:
     
     def refresh_file_list(self):
         """Refresh current directory's image file list"""
-        self.image_files.clear()
-        self.render_cache.clear()  # Clear memory cache
+        # Reuse a recent listing if the directory has not changed since it was scanned
+        try:
+            dir_mtime = os.stat(self.current_directory).st_mtime_ns
+        except OSError:
+            dir_mtime = None
         
-        # Clear temporary file cache
-        self._clear_temp_cache()
+        cached = self._dir_cache.get(self.current_directory)
+        if cached is not None and dir_mtime is not None and cached[0] == dir_mtime:
+            self._dir_cache.move_to_end(self.current_directory)
+            _, files, index, strs = cached
+            self.image_files = list(files)
+            self._image_index = dict(index)
+            self._image_strs = list(strs)
+            self._sort_keys = None
+            self._file_keys = {}  # Files may have been edited in place since, stat them again
+            self.current_index = 0
+            self.preload_renders()
+            return
+        
+        # Fresh lists rather than clear(), a preload pass may still hold the old ones
+        self.image_files = []
+        self._image_index = {}
+        self._image_strs = []
+        self._sort_keys = None
+        self._file_keys = {}
+        self._cache_clear()  # Clear memory cache
         
+        # Temporary files are keyed by path, mtime and size and kept, so returning to a directory stays warm
         try:
-            for item in self.current_directory.iterdir():
-                if item.is_file() and self.is_image_file(item):
-                    self.image_files.append(item)
+            # scandir reuses the directory entry type, avoiding a Path and a stat per entry
+            with os.scandir(self.current_directory) as entries:
+                candidates = [entry for entry in entries if _is_image_name(entry.name)]
+            self.image_files.extend(self._scan_files(candidates))
             
             # Sort by filename
-            self.image_files.sort()
+            self.image_files.sort(key=_sort_key)
+            self._rebuild_index()
             self.current_index = 0
             
+            # Remember listing for quick return to this directory
+            if dir_mtime is not None:
+                self._dir_cache[self.current_directory] = (
+                    dir_mtime, tuple(self.image_files), dict(self._image_index), tuple(self._image_strs)
+                )
+                self._dir_cache.move_to_end(self.current_directory)
+                while len(self._dir_cache) > DIR_CACHE_SIZE:
+                    self._dir_cache.popitem(last=False)
+            
             # Start pre-rendering
             self.preload_renders()
             
         except Exception as e:
             print(f"Error reading directory: {e}")
     
+    def _scan_files(self, candidates: List[os.DirEntry]) -> List[Path]:
+        """Filter image-named entries down to files, in parallel for large directories"""
+        # is_file() is free when the file system reports the entry type, but needs a stat
+        # for symlinks and on file systems that do not (often network mounts), so overlap
+        # those stats once there are enough of them to pay for the thread handoff
+        if len(candidates) <= PARALLEL_SCAN_THRESHOLD:
+            return _filter_files(candidates)
+        
+        if self._scan_executor is None:
+            self._scan_executor = ThreadPoolExecutor(max_workers=SCAN_WORKERS, thread_name_prefix="dir_scan")
+        chunks = [candidates[i:i + SCAN_CHUNK_SIZE] for i in range(0, len(candidates), SCAN_CHUNK_SIZE)]
+        return [img_path for files in self._scan_executor.map(_filter_files, chunks) for img_path in files]
+    
+    def _rebuild_index(self):
+        """Rebuild path lookups after image_files changes"""
+        self._image_strs = [str(img_path) for img_path in self.image_files]
+        self._image_index = {path_str: i for i, path_str in enumerate(self._image_strs)}
+    
+    def remove_image(self, img_path: Path) -> bool:
+        """Remove image from file list"""
+        path_str = str(img_path)
+        index = self._image_index.get(path_str)
+        if index is None:
+            return False
+        
+        del self.image_files[index]
+        if self._sort_keys is not None:
+            del self._sort_keys[index]
+        self._rebuild_index()
+        key = self._file_keys.pop(path_str, None)
+        if key is not None:
+            self._cache_pop(key)
+        return True
+    
     def preload_renders(self):
         """Pre-render images"""
         if not self.image_files or not self.preload_enabled:
             return
         
-        # Submit pre-render tasks to thread pool
-        self.render_executor.submit(self._render_worker)
-    
-    
+        # Start the preload thread on first use
+        with self._preload_lock:
+            if self._preload_thread is None:
+                self._preload_thread = threading.Thread(
+                    target=self._render_worker, name="chafa_render", daemon=True
+                )
+                self._preload_thread.start()
+        
+        self._preload_wakeup.set()
     
     def _render_worker(self):
         """Pre-render worker thread"""
-        import time
+        _lower_thread_priority()
+        while True:
+            self._preload_wakeup.wait()
+            self._preload_wakeup.clear()
+            if self._preload_stop:
+                return
+            self._render_window()
+    
+    def _render_window(self):
+        """Pre-render the window around the current image"""
+        futures = {}
         try:
+            # Listings are replaced, never mutated in place, so this reference stays valid
+            # even if a refresh happens during the pass
+            current = self.current_index
+            image_strs = self._image_strs
+            
             # Pre-render 10 images before/after current to temporary files
-            start_idx = max(0, self.current_index - self.file_cache_range)
-            end_idx = min(len(self.image_files), self.current_index + self.file_cache_range + 1)
+            start_idx = max(0, current - self.file_cache_range)
+            end_idx = min(len(image_strs), current + self.file_cache_range + 1)
             
-            for i in range(start_idx, end_idx):
-                if i != self.current_index:  # Skip current image
-                    img_path = self.image_files[i]
-                    
-                    # Check if already cached to temporary file
-                    if not self._get_cache_file_path(img_path).exists():
-                        try:
-                            # Use ChafaWrapper to pre-render
-                            rendered = ChafaWrapper.render_image(str(img_path))
-                            if rendered:
-                                # Save to temporary file
-                                self._save_to_temp_cache(img_path, rendered)
-                                
-                                # If in memory cache range, also save to memory
-                                if self._is_in_memory_range(img_path):
-                                    self.render_cache[img_path] = rendered
-                            
-                            time.sleep(PRELOAD_SLEEP_TIME)  # Avoid using too much CPU
-                        except Exception:
-                            pass  # Ignore failed rendering
+            # Submit images not yet cached, nearest neighbours first,
+            # so up to CHAFA_WORKERS chafa processes run in parallel
+            for i in self._preload_order(current, start_idx, end_idx):
+                try:
+                    key = self._file_key(image_strs[i])
+                except OSError:
+                    continue  # Deleted since the listing was read
+                if key not in self.render_cache and not self._has_temp_cache(key):
+                    future = self.chafa_executor.submit(self._prerender, key)
+                    futures[future] = key
             
-            # Clear memory cache, keep only current image and one before/after
-            self._cleanup_memory_cache()
+            for future in as_completed(futures):
+                key = futures[future]
+                data = future.result()
+                
+                # Listing was replaced by a refresh, don't refill the cleared cache with stale renders
+                if self._image_strs is not image_strs:
+                    break
+                
+                # Keep every render in memory; the byte budget decides what stays
+                if data:
+                    self._cache_put(key, data)
+                
+                # User moved on, drop the rest of this window
+                if self.current_index != current or self._preload_stop:
+                    break
             
         except Exception:
             pass  # Ignore pre-rendering errors
-    
-    def _cleanup_memory_cache(self):
-        """Clean up memory cache, keep only current image and one before/after"""
-        if not self.image_files:
-            return
-        
-        # Find images that should be kept in memory
-        to_keep = set()
-        start_idx = max(0, self.current_index - 1)
-        end_idx = min(len(self.image_files), self.current_index + 2)
-        
-        for i in range(start_idx, end_idx):
-            to_keep.add(self.image_files[i])
-        
-        # Clean up memory cache not in retention range
-        to_remove = []
-        for img_path in self.render_cache:
-            if img_path not in to_keep:
-                to_remove.append(img_path)
+        finally:
+            # Renders not yet started are cancelled; the next pass resubmits what it needs
+            for future in futures:
+                future.cancel()
+    
+    def _prerender(self, key: tuple) -> Optional[bytes]:
+        """Render one image and spill it to temporary file on the calling worker if large"""
+        rendered = ChafaWrapper.render_image(key[0])
+        if rendered:
+            # Done once here so the viewer can draw over the previous frame without rewriting it.
+            # Erased at the start of each line, not the end: after a full-width row the cursor
+            # waits to wrap and an erase there would take out the last column
+            rendered = ERASE_LINE_END + rendered.replace(b'\n', b'\n' + ERASE_LINE_END)
+        if rendered and len(rendered) >= SMALL_RENDER_LIMIT:
+            # Writing here lets cache writes run in parallel with other renders
+            self._save_to_temp_cache(key, rendered)
+        return rendered
+    
+    @staticmethod
+    def _preload_order(current: int, start_idx: int, end_idx: int):
+        """Yield indices in [start_idx, end_idx) outward from current: +1, -1, +2, -2, ..."""
+        for distance in range(1, max(current - start_idx, end_idx - current - 1) + 1):
+            if current + distance < end_idx:
+                yield current + distance
+            if current - distance >= start_idx:
+                yield current - distance
+    
+    def _file_key(self, path_str: str, refresh: bool = False) -> tuple:
+        """Get the cache key (path, mtime_ns, size) of an image, stat'ing it on first use or refresh"""
+        key = None if refresh else self._file_keys.get(path_str)
+        if key is None:
+            stat = os.stat(path_str)
+            key = (path_str, stat.st_mtime_ns, stat.st_size)
+            self._file_keys[path_str] = key
+        return key
+    
+    def _cache_put(self, key: tuple, rendered_data: bytes):
+        """Store render in memory cache, evicting least recently used entries over budget"""
+        with self._cache_lock:
+            previous = self.render_cache.pop(key, None)
+            if previous is not None:
+                self._cache_bytes -= len(previous)
+            
+            self.render_cache[key] = rendered_data
+            self._cache_bytes += len(rendered_data)
+            
+            while self._cache_bytes > self._cache_budget and len(self.render_cache) > 1:
+                _, evicted = self.render_cache.popitem(last=False)
+                self._cache_bytes -= len(evicted)
+    
+    def _cache_get(self, key: tuple) -> Optional[bytes]:
+        """Get render from memory cache and mark it recently used"""
+        with self._cache_lock:
+            rendered_data = self.render_cache.get(key)
+            if rendered_data is not None:
+                self.render_cache.move_to_end(key)
+            return rendered_data
+    
+    def _cache_pop(self, key: tuple):
+        """Remove render from memory cache"""
+        with self._cache_lock:
+            rendered_data = self.render_cache.pop(key, None)
+            if rendered_data is not None:
+                self._cache_bytes -= len(rendered_data)
+    
+    def _cache_clear(self):
+        """Clear memory cache"""
+        with self._cache_lock:
+            self.render_cache.clear()
+            self._cache_bytes = 0
+    
+    def _ensure_temp_dir(self):
+        """Create temporary file cache directory on first use"""
+        if self.temp_dir is None:
+            with self._temp_lock:
+                if self.temp_dir is None:
+                    self.temp_dir = tempfile.mkdtemp(prefix="pixelterm_cache_")
+    
+    def _get_cache_file_path(self, key: tuple) -> str:
+        """Get cache file path for a cache key, temp_dir must already exist"""
+        cache_file = self._cache_path_memo.get(key)
+        if cache_file is not None:
+            return cache_file
         
-        for img_path in to_remove:
-            del self.render_cache[img_path]
-    
-    def _get_cache_file_path(self, img_path: Path) -> Path:
-        """Get cache file path for image"""
-        # Use file path hash as cache filename to avoid long paths and special characters
-        path_str = str(img_path.absolute())
-        hash_obj = hashlib.md5(path_str.encode())
-        cache_filename = f"{hash_obj.hexdigest()}.txt"
-        return Path(self.temp_dir) / cache_filename
+        # Use file path hash as cache filename to avoid long paths and special characters;
+        # mtime and size are part of it, so an edited image gets a new cache file
+        path_str, mtime_ns, size = key
+        hash_input = f"{os.path.abspath(path_str)}\0{mtime_ns}\0{size}".encode()
+        # Only a few dozen paths need telling apart, so a short fast hash is enough
+        if xxhash is not None:
+            digest = xxhash.xxh3_64(hash_input).hexdigest()
+        else:
+            digest = hashlib.blake2b(hash_input, digest_size=8).hexdigest()
+        # Plain string join, the cache file path never leaves this class
+        cache_file = os.path.join(self.temp_dir, f"{digest}.txt")
+        self._cache_path_memo[key] = cache_file
+        return cache_file
+    
+    def _has_temp_cache(self, key: tuple) -> bool:
+        """Check whether a render for a cache key is on disk"""
+        if self.temp_dir is None:
+            return False
+        return os.path.exists(self._get_cache_file_path(key))
     
     def _clear_temp_cache(self):
         """Clear temporary file cache"""
+        with self._temp_lock:
+            temp_dir, self.temp_dir = self.temp_dir, None  # Recreated by the next write
+            self._cache_path_memo.clear()  # Memoized paths point into the old directory
+            self._temp_bytes = 0
+        if temp_dir is not None:
+            # A chafa worker may still be writing into it, so don't fail on a late file
+            self._old_temp_dirs.append(temp_dir)
+            shutil.rmtree(temp_dir, ignore_errors=True)
+    
+    def invalidate_cache(self):
+        """Drop all cached renders, in memory and on disk"""
+        self._cache_clear()
+        self._clear_temp_cache()
+    
+    def _evict_temp_cache(self):
+        """Delete oldest temporary files until the cache is back to 3/4 of its budget"""
+        temp_dir = self.temp_dir
+        if temp_dir is None:
+            return
+        
         try:
-            if hasattr(self, 'temp_dir') and self.temp_dir and os.path.exists(self.temp_dir):
-                shutil.rmtree(self.temp_dir)
-            self.temp_dir = tempfile.mkdtemp(prefix="pixelterm_cache_")
-        except Exception:
-            pass
+            files = []
+            with os.scandir(temp_dir) as entries:
+                for entry in entries:
+                    stat = entry.stat()
+                    files.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        except OSError:
+            return
+        
+        files.sort()
+        total = sum(size for _, size, _ in files)
+        target = self._temp_budget * 3 // 4
+        for _, size, path in files:
+            if total <= target:
+                break
+            try:
+                os.unlink(path)
+                total -= size
+            except OSError:
+                pass
+        
+        with self._temp_lock:
+            self._temp_bytes = total
     
-    def _save_to_temp_cache(self, img_path: Path, rendered_data: str):
+    def _save_to_temp_cache(self, key: tuple, rendered_data: bytes):
         """Save rendered data to temporary file"""
         try:
-            cache_file = self._get_cache_file_path(img_path)
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                f.write(rendered_data)
+            self._ensure_temp_dir()
+            cache_file = self._get_cache_file_path(key)
+            if TEMP_CACHE_COMPRESS:
+                rendered_data = _compress_render(rendered_data)
+            
+            # Unbuffered write straight from the render bytes, usually one syscall; a render
+            # spilled again after leaving memory overwrites a file that is already counted
+            fd = os.open(cache_file, os.O_WRONLY | os.O_CREAT, 0o600)
+            try:
+                previous_size = os.fstat(fd).st_size
+                view = memoryview(rendered_data)
+                while view:
+                    view = view[os.write(fd, view):]
+                os.ftruncate(fd, len(rendered_data))
+            finally:
+                os.close(fd)
+            
+            with self._temp_lock:
+                self._temp_bytes += len(rendered_data) - previous_size
+                over_budget = self._temp_bytes > self._temp_budget
+            if over_budget:
+                self._evict_temp_cache()
         except Exception:
             pass
     
-    def _load_from_temp_cache(self, img_path: Path) -> Optional[str]:
+    def _load_from_temp_cache(self, key: tuple) -> Optional[bytes]:
         """Load rendered data from temporary file"""
+        if self.temp_dir is None:
+            return None
+        
         try:
-            cache_file = self._get_cache_file_path(img_path)
-            if cache_file.exists():
-                with open(cache_file, 'r', encoding='utf-8') as f:
-                    return f.read()
-        except Exception:
-            pass
-        return None
-    
-    def _is_in_memory_range(self, img_path: Path) -> bool:
-        """Check if image should be in memory cache range (current and one before/after)"""
-        if not self.image_files:
-            return False
+            fd = os.open(self._get_cache_file_path(key), os.O_RDONLY)
+        except OSError:
+            return None
         
         try:
-            img_index = self.image_files.index(img_path)
-            return abs(img_index - self.current_index) <= 1
-        except ValueError:
-            return False
+            # Read the whole file in one call sized from fstat
+            size = os.fstat(fd).st_size
+            chunks = []
+            while size > 0:
+                chunk = os.read(fd, size)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                size -= len(chunk)
+            data = b''.join(chunks)
+            if TEMP_CACHE_COMPRESS and data:
+                data = _decompress_render(data)
+            return data
+        except Exception:
+            return None
+        finally:
+            os.close(fd)
     
-    def get_rendered_image(self, img_path: Path) -> Optional[str]:
+    def get_rendered_image(self, img_path: Path) -> Optional[bytes]:
         """Get pre-rendered image data"""
+        try:
+            key = self._file_key(str(img_path))
+        except OSError:
+            return None
+        
         # First check memory cache
-        if img_path in self.render_cache:
-            return self.render_cache[img_path]
+        cached_data = self._cache_get(key)
+        if cached_data is not None:
+            return cached_data
         
         # If not in memory cache, try loading from temporary file
-        cached_data = self._load_from_temp_cache(img_path)
+        cached_data = self._load_from_temp_cache(key)
         if cached_data:
-            # If image is in memory cache range, load to memory
-            if self._is_in_memory_range(img_path):
-                self.render_cache[img_path] = cached_data
+            self._cache_put(key, cached_data)
             return cached_data
         
         return None
     
     def cleanup(self):
         """Clean up resources"""
-        if hasattr(self, 'render_executor'):
-            self.render_executor.shutdown(wait=False)
+        self._preload_stop = True
+        self._preload_wakeup.set()
+        if hasattr(self, 'chafa_executor'):
+            self.chafa_executor.shutdown(wait=False)
+        if self._scan_executor is not None:
+            self._scan_executor.shutdown(wait=False)
         
-        # Clear temporary file cache
-        try:
-            if hasattr(self, 'temp_dir') and self.temp_dir and os.path.exists(self.temp_dir):
-                shutil.rmtree(self.temp_dir)
-        except Exception:
-            pass
+        # Stop the persistent chafa render server
+        ChafaWrapper.stop_server()
+        
+        # Clear temporary file cache, including directories dropped on resize
+        if self.temp_dir is not None:
+            self._old_temp_dirs.append(self.temp_dir)
+        for temp_dir in self._old_temp_dirs:
+            shutil.rmtree(temp_dir, ignore_errors=True)
     
     def is_image_file(self, filepath: Path) -> bool:
         """Check if file is supported image format"""
-        return filepath.suffix.lower() in SUPPORTED_FORMATS
+        return _is_image_name(filepath.name)
     
     def get_image_count(self) -> int:
         """Get current directory image count"""
@@ -310,15 +662,18 @@ class FileBrowser:
             return
         
         # 确保当前图片在内存缓存中
-        current_img = self.get_current_image()
-        if current_img and current_img not in self.render_cache:
+        if not 0 <= self.current_index < len(self._image_strs):
+            return
+        # Stat the image again so an edit since the listing was read is picked up
+        try:
+            key = self._file_key(self._image_strs[self.current_index], refresh=True)
+        except OSError:
+            return
+        if key not in self.render_cache:
             # 尝试从临时文件加载
-            cached_data = self._load_from_temp_cache(current_img)
+            cached_data = self._load_from_temp_cache(key)
             if cached_data:
-                self.render_cache[current_img] = cached_data
-        
-        # 清理不在内存范围内的缓存
-        self._cleanup_memory_cache()
+                self._cache_put(key, cached_data)
     
     
     
@@ -352,9 +707,10 @@ class FileBrowser:
         """Get subdirectories of current directory"""
         subdirs = []
         try:
-            for item in self.current_directory.iterdir():
-                if item.is_dir() and not item.name.startswith('.'):
-                    subdirs.append(item.name)
+            with os.scandir(self.current_directory) as entries:
+                for entry in entries:
+                    if not entry.name.startswith('.') and entry.is_dir():
+                        subdirs.append(entry.name)
             subdirs.sort()
         except Exception:
             pass
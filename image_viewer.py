@@ -5,13 +5,21 @@ Uses chafa command line tool to display images in terminal
 """
 
 import os
-import subprocess
+import shutil
+import signal
 import sys
+import threading
 from typing import Optional, Tuple
 from pathlib import Path
-from PIL import Image
 from chafa_wrapper import ChafaWrapper
 
+# Terminal control sequences
+CLEAR_SCREEN = b'\x1b[H\x1b[2J'
+CURSOR_HOME = b'\x1b[H'
+ERASE_BELOW = b'\x1b[0J'
+HIDE_CURSOR = b'\x1b[?25l'
+SHOW_CURSOR = b'\x1b[?25h'
+
 
 class ImageViewer:
     """Terminal image viewer"""
@@ -19,117 +27,105 @@ class ImageViewer:
     def __init__(self, width: int = 80, height: int = 24):
         self.width = width
         self.height = height
-        from constants import SUPPORTED_FORMATS
-        self.supported_formats = SUPPORTED_FORMATS
+        
+        # Terminal size cached until SIGWINCH, None when no handler could be installed
+        self._term_size: Optional[Tuple[int, int]] = None
+        self._previous_winch_handler = None
+        if hasattr(signal, 'SIGWINCH') and threading.current_thread() is threading.main_thread():
+            self._term_size = self._query_terminal_size()
+            self._previous_winch_handler = signal.signal(signal.SIGWINCH, self._on_resize)
     
-    def get_terminal_size(self) -> Tuple[int, int]:
-        """Get terminal size"""
+    def _query_terminal_size(self) -> Tuple[int, int]:
+        """Query terminal size from the OS"""
         try:
-            import shutil
             size = shutil.get_terminal_size()
             return size.columns, size.lines
         except:
             return 80, 24
     
+    def _on_resize(self, signum, frame):
+        """SIGWINCH handler, refresh cached terminal size"""
+        self._term_size = self._query_terminal_size()
+        ChafaWrapper.reset_terminal_size()
+        if callable(self._previous_winch_handler):
+            self._previous_winch_handler(signum, frame)
     
+    def get_terminal_size(self) -> Tuple[int, int]:
+        """Get terminal size"""
+        if self._term_size is not None:
+            return self._term_size
+        return self._query_terminal_size()
     
-    def is_image_file(self, filepath: str) -> bool:
-        """Check if file is supported image format"""
-        _, ext = os.path.splitext(filepath.lower())
-        return ext in self.supported_formats
-    
-    
-    
-    def display_image(self, filepath: str, scale: float = 1.0, file_browser=None) -> bool:
-        """Display image using chafa"""
-        try:
-            # Try to use pre-rendered data
-            rendered_output = None
-            if file_browser:
-                rendered_output = file_browser.get_rendered_image(Path(filepath))
-            
-            if rendered_output:
-                # Use pre-rendered data, output directly
-                print(rendered_output, end='')
-                return True
-            
-            # If no pre-rendered data, use ChafaWrapper for real-time rendering
-            rendered = ChafaWrapper.render_image(filepath, scale)
-            if rendered:
-                print(rendered, end='')
-                return True
-            
-            return False
-                
-        except Exception:
-            return False
-    
-    def clear_display_area(self):
-        """Clear current display area"""
-        term_width, term_height = self.get_terminal_size()
-        # Move cursor to top-left corner
-        print('\033[H', end='', flush=True)
-        # Clear entire screen
-        print('\033[2J', end='', flush=True)
-        # Flush output immediately to ensure clear command takes effect
+    def _write_bytes(self, data: bytes):
+        """Write raw bytes straight to the terminal fd, bypassing stdout buffering"""
+        # Flush pending text output first to keep escape sequences in order
         sys.stdout.flush()
+        fd = sys.stdout.fileno()
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
     
-    def display_filename(self, filepath: str):
-        """Display filename centered below image"""
-        try:
-            # Get terminal width
-            term_width, _ = self.get_terminal_size()
-            
-            # Get filename (without path)
-            filename = Path(filepath).name
-            
-            # Calculate center position
-            filename_len = len(filename)
-            if filename_len < term_width:
-                # 计算左边距以居中显示
-                left_padding = (term_width - filename_len) // 2
-                centered_filename = ' ' * left_padding + filename
+    def _filename_sequence(self, filepath: str) -> str:
+        """Build escape sequence that draws filename centered on the second to last line"""
+        # Get terminal size
+        term_width, term_height = self.get_terminal_size()
+        
+        # Get filename (without path)
+        filename = Path(filepath).name
+        
+        # Calculate center position
+        filename_len = len(filename)
+        if filename_len < term_width:
+            # 计算左边距以居中显示
+            left_padding = (term_width - filename_len) // 2
+            centered_filename = ' ' * left_padding + filename
+        else:
+            # If filename is too long, truncate and add ellipsis
+            max_len = term_width - 3  # 留出省略号的空间
+            if max_len > 0:
+                centered_filename = filename[:max_len] + '...'
             else:
-                # If filename is too long, truncate and add ellipsis
-                max_len = term_width - 3  # 留出省略号的空间
-                if max_len > 0:
-                    centered_filename = filename[:max_len] + '...'
-                else:
-                    centered_filename = '...'
-            
-            # Move to bottom of terminal (second to last line)
-            print(f'\033[{self.get_terminal_size()[1]-1};1H', end='')
-            
-            # Clear line and display filename
-            print('\033[K', end='')  # 清除当前行
-            print(f'\033[36m{centered_filename}\033[0m', end='')  # Display filename in cyan
-            
-            # Flush output immediately
-            sys.stdout.flush()
-        except Exception:
-            # If filename display fails, ignore silently
-            pass
+                centered_filename = '...'
+        
+        # Move to bottom of terminal, clear line and display filename in cyan
+        return f'\033[{term_height-1};1H\033[K\033[36m{centered_filename}\033[0m'
     
     def display_image_with_info(self, filepath: str, scale: float = 1.0, clear_first: bool = True, file_browser=None) -> bool:
         """Display image"""
-        if clear_first:
-            # Clear display area
-            self.clear_display_area()
-        print('\033[?25l', end='')  # Hide cursor
+        # Clear display area and hide cursor
+        prefix = (CLEAR_SCREEN if clear_first else b'') + HIDE_CURSOR
         
-        # Display image
-        result = self.display_image(filepath, scale, file_browser)
+        # Try to use pre-rendered data
+        rendered_output = None
+        if file_browser:
+            try:
+                rendered_output = file_browser.get_rendered_image(Path(filepath))
+            except Exception:
+                rendered_output = None
         
-        # Display filename centered below image
-        if result:
-            self.display_filename(filepath)
+        if rendered_output:
+            if clear_first:
+                # Draw over the previous frame in place instead of blanking the screen first;
+                # cached lines already start with erase-to-end-of-line, erase below what is left
+                prefix = CURSOR_HOME + HIDE_CURSOR
+                rendered_output = rendered_output + ERASE_BELOW
+            
+            # Emit the whole frame, filename and cursor restore in one write
+            self._write_bytes(
+                prefix + rendered_output + self._filename_sequence(filepath).encode('utf-8') + SHOW_CURSOR
+            )
+            return True
+        
+        # Without pre-rendered data chafa writes the image itself between prefix and suffix
+        self._write_bytes(prefix)
+        result = ChafaWrapper.render_to_stdout(filepath, scale)
         
-        # Show cursor after display
-        print('\033[?25h', end='', flush=True)  # Show cursor
+        # Display filename centered below image, then show cursor
+        suffix = self._filename_sequence(filepath).encode('utf-8') if result else b''
+        self._write_bytes(suffix + SHOW_CURSOR)
         
         return result
 
-
 if __name__ == "__main__":
     if len(sys.argv) != 2:
         print("Usage: python image_viewer.py <image_path>")
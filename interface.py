@@ -8,36 +8,163 @@ import os
 import sys
 import termios
 import tty
+from collections import OrderedDict
 from contextlib import contextmanager
 from typing import Optional, Callable
+from PIL import Image
+from constants import IMAGE_INFO_CACHE_SIZE
 
+# Register PIL format plugins at startup rather than on the first info keypress
+Image.init()
+# Only image headers are read here (chafa does the decoding), so the pixel-count bomb check just gets in the way
+Image.MAX_IMAGE_PIXELS = None
 
-class Interface:
-    """终端用户界面"""
-    
-    def __init__(self):
-        self.old_settings = None
-        self.help_text = """
+# CSI sequences (ESC [ ...) end with a byte in 0x40-0x7E, e.g. A-D for arrows, ~ for Delete/PgUp
+_ESC_FINAL = frozenset(range(0x40, 0x7f))
+_ESC_MAX_LEN = 16  # Give up on malformed sequences after this many bytes
+
+# File size units indexed by (bit_length - 1) // 10; bytes are shown without decimals
+_UNITS = ('{:.0f} B', '{:.1f} KB', '{:.1f} MB', '{:.1f} GB')
+_DIV = (1, 1024, 1024 * 1024, 1024 * 1024 * 1024)
+
+# User-facing strings per language, selected once from LANG
+STRINGS = {
+    'en': {
+        'help_text': """
 🖼️  PixelTerm - Terminal Image Viewer
 
 📋 Shortcuts:
   ←/→     Previous/Next image
   a/d     Alternative left/right keys
   i       Show/hide image information
+  h       Show this help
   r       Delete current image
   q       Quit program
   Ctrl+C  Force exit
-        """
+        """,
+        'no_subdirectories': "\n📁 No subdirectories in current directory",
+        'subdirectory_list': "\n📁 Subdirectory list:",
+        'subdirectory_item': "  {index}. {name}",
+        'subdirectory_hint': "\nEnter directory name to enter, or press Esc to cancel:",
+        'prompt_directory': "Enter directory name: ",
+        'error': "\n❌ Error: {message}",
+        'info': "\nℹ️  {message}",
+        'press_any_key': "Press any key to continue...",
+        'image_details': "📸 Image Details",
+        'filename': "📁 Filename: {name}",
+        'path': "📂 Path: {path}",
+        'index': "📄 Index: {index}/{total}",
+        'file_size': "💾 File size: {size}",
+        'dimensions': "📐 Dimensions: {width} x {height} pixels",
+        'format': "🎨 Format: {format}",
+        'color_mode': "🎭 Color mode: {mode}",
+        'aspect_ratio': "📏 Aspect ratio: {ratio:.2f}",
+        'has_exif': "📷 Contains EXIF information",
+        'info_unreadable': "❌ Unable to read image information: {error}",
+        'info_failed': "\n❌ Error displaying information: {error}",
+        'confirm_delete': "\nAre you sure you want to delete image '{name}'? (y/N): ",
+        'delete_failed': "Deletion failed: {error}",
+        'no_more_images': "No more images",
+        'no_images_found': "No images found",
+        'max_zoom': "Maximum zoom level reached",
+        'min_zoom': "Minimum zoom level reached",
+        'at_root': "Already at root directory",
+        'cannot_enter_directory': "Cannot enter directory: {name}",
+        'directory_missing': "Directory does not exist: {name}",
+        'no_subdirectories_short': "No subdirectories in current directory",
+        'cannot_open_image': "Cannot open image file: {path}",
+        'cannot_open_directory': "Cannot open directory: {path}",
+        'path_missing': "Error: Path does not exist {path}",
+    },
+    'zh': {
+        'help_text': """
+🖼️  PixelTerm - 终端图片浏览器
+
+📋 快捷键:
+  ←/→     上一张/下一张
+  a/d     备用左右键
+  i       显示/隐藏图片信息
+  h       显示帮助
+  r       删除当前图片
+  q       退出程序
+  Ctrl+C  强制退出
+        """,
+        'no_subdirectories': "\n📁 当前目录没有子目录",
+        'subdirectory_list': "\n📁 子目录列表:",
+        'subdirectory_item': "  {index}. {name}",
+        'subdirectory_hint': "\n输入目录名进入，或按Esc取消:",
+        'prompt_directory': "输入目录名: ",
+        'error': "\n❌ 错误: {message}",
+        'info': "\nℹ️  {message}",
+        'press_any_key': "按任意键继续...",
+        'image_details': "📸 图片详情",
+        'filename': "📁 文件名: {name}",
+        'path': "📂 路径: {path}",
+        'index': "📄 序号: {index}/{total}",
+        'file_size': "💾 文件大小: {size}",
+        'dimensions': "📐 尺寸: {width} x {height} 像素",
+        'format': "🎨 格式: {format}",
+        'color_mode': "🎭 颜色模式: {mode}",
+        'aspect_ratio': "📏 宽高比: {ratio:.2f}",
+        'has_exif': "📷 包含EXIF信息",
+        'info_unreadable': "❌ 无法读取图片信息: {error}",
+        'info_failed': "\n❌ 显示信息出错: {error}",
+        'confirm_delete': "\n确定要删除图片 '{name}' 吗? (y/N): ",
+        'delete_failed': "删除失败: {error}",
+        'no_more_images': "没有更多图片",
+        'no_images_found': "未找到图片",
+        'max_zoom': "已达到最大缩放级别",
+        'min_zoom': "已达到最小缩放级别",
+        'at_root': "已经在根目录",
+        'cannot_enter_directory': "无法进入目录: {name}",
+        'directory_missing': "目录不存在: {name}",
+        'no_subdirectories_short': "当前目录没有子目录",
+        'cannot_open_image': "无法打开图片文件: {path}",
+        'cannot_open_directory': "无法打开目录: {path}",
+        'path_missing': "错误: 路径不存在 {path}",
+    },
+}
+
+
+class Interface:
+    """终端用户界面"""
+    
+    def __init__(self):
+        self.old_settings = None
+        self._stdin_fd = None
+        self._keybuf = bytearray()  # Bytes read from the terminal but not yet consumed
+        self._mode = 'raw'  # 'raw' while browsing, 'cooked' during a prompt phase
+        language = os.environ.get('LANG', 'en')[:2]
+        self.language = language if language in STRINGS else 'en'
+        self.strings = STRINGS[self.language]
+        self.help_text = self.strings['help_text']
+        self._help_bytes = None  # Encoded on the first show_help() call
+        self._bar = '=' * 60
+        # Image metadata keyed by (path, mtime_ns, size), least recently used evicted
+        self._info_cache: "OrderedDict[tuple, dict]" = OrderedDict()
+    
+    def text(self, key: str, **fields) -> str:
+        """Look up a user-facing string in the active language and fill in its fields"""
+        return self.strings[key].format(**fields)
     
     def setup_terminal(self):
         """Setup terminal in raw mode"""
         try:
-            self.old_settings = termios.tcgetattr(sys.stdin)
-            tty.setraw(sys.stdin.fileno())
+            self._stdin_fd = sys.stdin.fileno()
+            self.old_settings = termios.tcgetattr(self._stdin_fd)
+            self._set_raw()
         except:
             # If unable to setup terminal mode, use normal input
             pass
     
+    def _set_raw(self):
+        """Put stdin in raw mode, reads block until at least one byte arrives"""
+        tty.setraw(self._stdin_fd)
+        attrs = termios.tcgetattr(self._stdin_fd)
+        attrs[6][termios.VMIN] = 1
+        attrs[6][termios.VTIME] = 0
+        termios.tcsetattr(self._stdin_fd, termios.TCSANOW, attrs)
+    
     def restore_terminal(self):
         """恢复终端设置"""
         if self.old_settings:
@@ -46,114 +173,244 @@ class Interface:
             except:
                 pass
     
+    def begin_cooked(self):
+        """Enter cooked mode for a prompt phase, no-op if already cooked"""
+        if self.old_settings and self._mode == 'raw':
+            self.restore_terminal()
+            self._mode = 'cooked'
     
+    def end_cooked(self):
+        """Leave the prompt phase and return to raw mode"""
+        if self.old_settings and self._mode == 'cooked':
+            try:
+                self._set_raw()
+                self._mode = 'raw'
+            except:
+                # Keep old_settings so exit still restores the terminal, and leave it in a known state
+                self.restore_terminal()
     
     def get_key(self) -> Optional[str]:
-        """获取键盘输入"""
+        """获取键盘输入 (普通模式，整行输入)"""
         try:
-            if self.old_settings:
-                # 原始模式 - 无超时，直接等待
-                return sys.stdin.read(1)
-            else:
-                # 普通模式
-                return input().strip()
+            return input().strip()
         except:
             return None
     
+    def get_key_sequence(self) -> Optional[str]:
+        """获取完整按键，ESC序列作为一个整体返回"""
+        # Without raw mode input arrives a line at a time
+        if not self.old_settings:
+            return self.get_key()
+        try:
+            key = self.get_key_bytes()
+        except OSError:
+            return None
+        # Decode once per complete key
+        return None if key is None else key.decode('utf-8', 'replace')
     
+    def _read_byte(self) -> Optional[int]:
+        """Pop one byte from the key buffer, blocking on the terminal when it is empty"""
+        if not self._keybuf:
+            data = os.read(self._stdin_fd, 32)
+            if not data:
+                return None
+            self._keybuf += data
+        byte = self._keybuf[0]
+        del self._keybuf[:1]
+        return byte
     
-    
-    
-    
-    
-    
+    def get_key_bytes(self) -> Optional[bytes]:
+        """Read one key as bytes: a character, or ESC then [ or O then bytes up to the final one"""
+        byte = self._read_byte()
+        if byte is None:
+            return None
+        
+        key = bytearray((byte,))
+        if byte == 0x1b:
+            # A lone Esc press arrives by itself, sequences arrive in one write
+            introducer = self._read_byte() if self._keybuf else None
+            if introducer is not None:
+                key.append(introducer)
+                if introducer == 0x4f:  # ESC O X
+                    remaining = 1
+                elif introducer == 0x5b:  # ESC [ params X
+                    remaining = _ESC_MAX_LEN - len(key)
+                else:
+                    remaining = 0
+                while remaining > 0:
+                    final = self._read_byte()
+                    if final is None:
+                        break
+                    key.append(final)
+                    remaining -= 1
+                    if introducer == 0x4f or final in _ESC_FINAL:
+                        break
+        elif byte >= 0xc0:
+            # Multi-byte UTF-8 character, the lead byte gives the number of continuation bytes
+            for _ in range(1 if byte < 0xe0 else 2 if byte < 0xf0 else 3):
+                continuation = self._read_byte()
+                if continuation is None:
+                    break
+                key.append(continuation)
+        return bytes(key)
     
     @contextmanager
     def _terminal_mode_switch(self):
         """终端模式切换上下文管理器"""
-        temp_settings = self.old_settings
+        # Inside a prompt phase the terminal is already cooked and stays so until end_cooked()
+        if self._mode == 'cooked':
+            yield
+            return
+        
+        self.begin_cooked()
         try:
-            if self.old_settings:
-                self.restore_terminal()
             yield
         finally:
-            if temp_settings:
-                try:
-                    self.old_settings = temp_settings
-                    tty.setraw(sys.stdin.fileno())
-                except:
-                    self.old_settings = None
+            self.end_cooked()
+    
+    @contextmanager
+    def _canon(self):
+        """Temporarily turn on line input and echo, restoring raw mode with one tcsetattr"""
+        attrs = termios.tcgetattr(self._stdin_fd)
+        cooked = [list(attr) if isinstance(attr, list) else attr for attr in attrs]
+        cooked[0] |= termios.ICRNL  # Enter sends CR, canonical mode ends lines on NL
+        cooked[3] |= termios.ICANON | termios.ECHO
+        termios.tcsetattr(self._stdin_fd, termios.TCSADRAIN, cooked)
+        try:
+            yield
+        finally:
+            termios.tcsetattr(self._stdin_fd, termios.TCSADRAIN, attrs)
+    
+    def confirm(self, prompt: str) -> bool:
+        """Ask a y/N question, only y or yes counts as confirmation"""
+        try:
+            if not self.old_settings:
+                response = input(prompt)
+            else:
+                # Raw mode has output post-processing off, so supply the carriage return
+                sys.stdout.flush()
+                os.write(sys.stdout.fileno(), prompt.replace('\n', '\r\n').encode('utf-8'))
+                with self._canon():
+                    response = os.read(self._stdin_fd, 64).decode('utf-8', 'replace')
+            return response.strip().lower() in ('y', 'yes')
+        except Exception:
+            return False
     
     def show_image_info(self, image_path, total_count: int, current_index: int):
         """Show detailed image information"""
-        import os
-        from PIL import Image
-        
+        # Collect all lines and emit them in one write
+        lines = []
         with self._terminal_mode_switch():
             try:
-                print(f"\n{'='*60}")
-                print(f"📸 Image Details")
-                print(f"{'='*60}")
+                lines.append(f"\n{self._bar}")
+                lines.append(self.text('image_details'))
+                lines.append(self._bar)
                 
                 # Basic information
-                print(f"📁 Filename: {image_path.name}")
-                print(f"📂 Path: {image_path.parent}")
-                print(f"📄 Index: {current_index + 1}/{total_count}")
+                lines.append(self.text('filename', name=image_path.name))
+                lines.append(self.text('path', path=image_path.parent))
+                lines.append(self.text('index', index=current_index + 1, total=total_count))
                 
                 # File size
-                file_size = os.path.getsize(image_path)
-                if file_size < 1024:
-                    size_str = f"{file_size} B"
-                elif file_size < 1024 * 1024:
-                    size_str = f"{file_size / 1024:.1f} KB"
-                elif file_size < 1024 * 1024 * 1024:
-                    size_str = f"{file_size / (1024 * 1024):.1f} MB"
-                else:
-                    size_str = f"{file_size / (1024 * 1024 * 1024):.1f} GB"
-                print(f"💾 File size: {size_str}")
+                stat = os.stat(image_path)
+                file_size = stat.st_size
+                unit = min(max(file_size.bit_length() - 1, 0) // 10, 3)
+                size_str = _UNITS[unit].format(file_size / _DIV[unit])
+                lines.append(self.text('file_size', size=size_str))
                 
                 # Image dimensions and format information
                 try:
-                    with Image.open(image_path) as img:
-                        width, height = img.size
-                        print(f"📐 Dimensions: {width} x {height} pixels")
-                        print(f"🎨 Format: {img.format}")
-                        print(f"🎭 Color mode: {img.mode}")
-                        
-                        # Calculate aspect ratio
-                        if height > 0:
-                            aspect_ratio = width / height
-                            print(f"📏 Aspect ratio: {aspect_ratio:.2f}")
-                        
-                        # If EXIF information exists, display basic info
-                        if hasattr(img, '_getexif') and img._getexif():
-                            exif = img._getexif()
-                            if exif:
-                                print(f"📷 Contains EXIF information")
+                    info = self._get_image_info(image_path, stat)
+                    width, height = info['width'], info['height']
+                    lines.append(self.text('dimensions', width=width, height=height))
+                    lines.append(self.text('format', format=info['format']))
+                    lines.append(self.text('color_mode', mode=info['mode']))
+                    
+                    # Calculate aspect ratio
+                    if height > 0:
+                        aspect_ratio = width / height
+                        lines.append(self.text('aspect_ratio', ratio=aspect_ratio))
+                    
+                    # If EXIF information exists, display basic info
+                    if info['has_exif']:
+                        lines.append(self.text('has_exif'))
                 except Exception as e:
-                    print(f"❌ Unable to read image information: {e}")
+                    lines.append(self.text('info_unreadable', error=e))
                 
-                print(f"{'='*60}")
+                lines.append(self._bar)
                 
             except Exception as e:
-                print(f"\n❌ Error displaying information: {e}")
+                lines.append(self.text('info_failed', error=e))
+            
+            self._write_lines(lines)
+    
+    def _get_image_info(self, image_path, stat: os.stat_result) -> dict:
+        """Read image metadata, reusing it while the file is unchanged"""
+        key = (str(image_path), stat.st_mtime_ns, stat.st_size)
+        info = self._info_cache.get(key)
+        if info is not None:
+            self._info_cache.move_to_end(key)
+            return info
+        
+        # One open with a 64KB buffer so PIL's small header reads are served from a single read()
+        fd = os.open(image_path, os.O_RDONLY)
+        with os.fdopen(fd, 'rb', buffering=65536) as f, Image.open(f) as img:
+            info = {
+                'width': img.size[0],
+                'height': img.size[1],
+                'format': img.format,
+                'mode': img.mode,
+                'has_exif': bool(hasattr(img, '_getexif') and img._getexif()),
+            }
+        
+        self._info_cache[key] = info
+        while len(self._info_cache) > IMAGE_INFO_CACHE_SIZE:
+            self._info_cache.popitem(last=False)
+        return info
+    
+    def show_help(self):
+        """Show help screen and wait for a key"""
+        if self._help_bytes is None:
+            # CRLF so it also lays out correctly in raw mode
+            text = self.help_text + '\n' + self.strings['press_any_key']
+            self._help_bytes = b'\x1b[H\x1b[2J' + text.replace('\n', '\r\n').encode('utf-8')
+        sys.stdout.flush()
+        os.write(sys.stdout.fileno(), self._help_bytes)
+        self.wait_for_key()
+    
+    def wait_for_key(self):
+        """Block until a key is pressed, an escape sequence counts as one key"""
+        try:
+            if self.old_settings:
+                self.get_key_bytes()
+            else:
+                input()  # Without raw mode input arrives a line at a time
+        except (OSError, EOFError):
+            pass
+    
+    def _write_lines(self, lines: list):
+        """Write lines to stdout as a single write"""
+        sys.stdout.write('\n'.join(lines) + '\n')
+        sys.stdout.flush()
     
     def show_directory_list(self, directories: list):
         """Show directory list"""
         if not directories:
-            print("\n📁 No subdirectories in current directory")
+            print(self.strings['no_subdirectories'])
             return
         
-        print("\n📁 Subdirectory list:")
-        for i, dirname in enumerate(directories):
-            print(f"  {i+1}. {dirname}")
-        print("\nEnter directory name to enter, or press Esc to cancel:")
+        item = self.strings['subdirectory_item']
+        self._write_lines(
+            [self.strings['subdirectory_list']]
+            + [item.format(index=index, name=dirname) for index, dirname in enumerate(directories, 1)]
+            + [self.strings['subdirectory_hint']]
+        )
     
     def prompt_directory(self) -> Optional[str]:
         """Prompt for directory name"""
         with self._terminal_mode_switch():
             try:
-                dirname = input("Enter directory name: ").strip()
+                dirname = input(self.strings['prompt_directory']).strip()
                 return dirname if dirname else None
             except:
                 return None
@@ -164,8 +421,8 @@ class Interface:
         """Show error message"""
         with self._terminal_mode_switch():
             try:
-                print(f"\n❌ Error: {message}")
-                input("Press any key to continue...")
+                print(self.strings['error'].format(message=message))
+                input(self.strings['press_any_key'])
             except:
                 pass
     
@@ -173,8 +430,8 @@ class Interface:
         """Show info message"""
         with self._terminal_mode_switch():
             try:
-                print(f"\nℹ️  {message}")
-                input("Press any key to continue...")
+                print(self.strings['info'].format(message=message))
+                input(self.strings['press_any_key'])
             except:
                 pass
 
@@ -185,17 +442,26 @@ class InputHandler:
     def __init__(self, interface: Interface):
         self.interface = interface
         self.handlers = {}
+        # Dispatch tables: single ASCII keys indexed by code point, everything else by string
+        self._ascii: list = [None] * 128
+        self._esc = {}
         self.running = True
     
     def register_handler(self, key: str, handler: Callable):
         """注册按键处理函数"""
         self.handlers[key] = handler
+        if len(key) == 1 and ord(key) < 128:
+            self._ascii[ord(key)] = handler
+        else:
+            self._esc[key] = handler
     
     def handle_input(self, key: str) -> bool:
         """处理输入"""
-        if key in self.handlers:
-            return self.handlers[key]()
-        return False
+        if len(key) == 1 and ord(key) < 128:
+            handler = self._ascii[ord(key)]
+        else:
+            handler = self._esc.get(key)
+        return handler() if handler else False
     
     def stop(self):
         """停止处理循环"""
@@ -207,6 +473,6 @@ if __name__ == "__main__":
     interface.setup_terminal()
     
     try:
-        print(interface.help_text)
+        interface.show_help()
     finally:
         interface.restore_terminal()
\ No newline at end of file
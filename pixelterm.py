@@ -14,9 +14,6 @@ from exceptions import ChafaNotFoundError
 # 添加当前目录到Python路径
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from image_viewer import ImageViewer
-from file_browser import FileBrowser
-from interface import Interface, InputHandler
 from config import Config, DisplayOptions
 
 
@@ -26,35 +23,63 @@ class PixelTerm:
     def __init__(self, path: str = None, preload_enabled: bool = True):
         self.config = Config()
         self.display_options = DisplayOptions(self.config)
-        self.interface = Interface()
-        self.image_viewer = ImageViewer()
-        self.file_browser = FileBrowser()
-        self.input_handler = InputHandler(self.interface)
         
-        # 按键序列缓冲区
-        self.key_buffer = ""
+        # Viewer, browser and terminal interface are created when run() starts
+        self.path = path
+        self.preload_enabled = preload_enabled
+        self.interface = None
+        self.image_viewer = None
+        self.file_browser = None
+        self.input_handler = None
         
         # Info display state
         self.info_displayed = False
         
+        # Handlers only request a redraw; run() performs at most one per key
+        self._refresh_pending = False
+        self._refresh_clear = True
+        
+        # Set by the SIGINT handler, checked by the main loop
+        self._quit_flag = False
+        
+        # Redraw only after the terminal reports a resize; chains to ImageViewer's size cache
+        self._size_dirty = False
+        self._previous_winch_handler = None
+    
+    def _lazy_init(self):
+        """Import and set up viewer, file browser and input handling on first run"""
+        if self.file_browser is not None:
+            return
+        
+        # Heavy modules (PIL, chafa wrapper, thread pools) are only loaded once we actually browse
+        from image_viewer import ImageViewer
+        from file_browser import FileBrowser
+        from interface import Interface, InputHandler
+        
+        self.interface = Interface()
+        self.image_viewer = ImageViewer()
+        self.file_browser = FileBrowser()
+        self.input_handler = InputHandler(self.interface)
+        
         # 设置预加载状态
-        self.file_browser.preload_enabled = preload_enabled
+        self.file_browser.preload_enabled = self.preload_enabled
         
         # 设置初始路径
+        path = self.path
         if path:
             path_obj = Path(path)
             if path_obj.is_file():
                 # 如果是文件，设置为图片文件
                 if not self.file_browser.set_image_file(path):
-                    print(f"Cannot open image file: {path}")
+                    print(self.interface.text('cannot_open_image', path=path))
                     sys.exit(1)
             elif path_obj.is_dir():
                 # 如果是目录，设置为目录
                 if not self.file_browser.set_directory(path):
-                    print(f"Cannot open directory: {path}")
+                    print(self.interface.text('cannot_open_directory', path=path))
                     sys.exit(1)
             else:
-                print(f"Error: Path does not exist {path}")
+                print(self.interface.text('path_missing', path=path))
                 sys.exit(1)
         else:
             self.file_browser.set_directory('.')
@@ -62,8 +87,9 @@ class PixelTerm:
         # 注册键盘事件处理器
         self.setup_key_handlers()
         
-        # 设置信号处理
-        signal.signal(signal.SIGINT, self.signal_handler)
+        # Installed after ImageViewer so the chain reaches its size cache
+        if hasattr(signal, 'SIGWINCH'):
+            self._previous_winch_handler = signal.signal(signal.SIGWINCH, self._on_resize)
     
     def setup_key_handlers(self):
         """Setup keyboard event handlers"""
@@ -82,64 +108,66 @@ class PixelTerm:
         
         # Information display
         self.input_handler.register_handler('i', self.show_image_info)
+        self.input_handler.register_handler('h', self.show_help)
         
         # Delete image
         self.input_handler.register_handler('r', self.delete_current_image)
     
     def signal_handler(self, signum, frame):
         """Signal handler"""
-        # Force exit, skip confirmation
-        self.input_handler.stop()
+        # Force exit, skip confirmation; only set a flag, the main loop does the rest
+        self._quit_flag = True
+    
+    def _on_resize(self, signum, frame):
+        """SIGWINCH handler, mark display for redraw"""
+        if callable(self._previous_winch_handler):
+            self._previous_winch_handler(signum, frame)
+        self._size_dirty = True
     
     def run(self):
         """Run main loop"""
+        self._lazy_init()
+        
         # Check if there are images, if not, don't setup terminal mode
         has_images = self.file_browser.get_current_image() is not None
         
         if has_images:
             self.interface.setup_terminal()
-        
-        # Remember last terminal size
-        last_term_size = self.image_viewer.get_terminal_size()
+            # Installed after raw mode is set up so an early Ctrl+C cannot race the tty switch
+            signal.signal(signal.SIGINT, self.signal_handler)
         
         try:
             self.refresh_display()
             
-            while self.input_handler.running and has_images:
-                # Check if terminal size has changed
-                current_term_size = self.image_viewer.get_terminal_size()
-                if current_term_size != last_term_size:
-                    last_term_size = current_term_size
-                    # Terminal size changed, redraw
-                    self.refresh_display(clear_first=True)
+            while self.input_handler.running and not self._quit_flag and has_images:
+                # Blocking read, escape sequences arrive as one key
+                key = self.interface.get_key_sequence()
+                
+                # Check if terminal size changed while waiting, before the key is handled
+                # so it never draws an old-size frame; both share the redraw below
+                if self._size_dirty:
+                    self._size_dirty = False
+                    # Cached frames were rendered for the old size
+                    self.file_browser.invalidate_cache()
+                    self.file_browser.preload_renders()
+                    self._request_refresh(clear_first=True)
                 
-                # Read key directly, don't use select detection
-                key = self.interface.get_key()
                 if key:
-                    # Add key to buffer
-                    self.key_buffer += key
-                    
-                    # Try to handle key sequence in buffer
-                    handled = self.input_handler.handle_input(self.key_buffer)
-                    
-                    if handled:
-                        # If handled successfully, clear buffer
-                        self.key_buffer = ""
-                    elif len(self.key_buffer) > 10:
-                        # If buffer is too long and not handled, clear it
-                        self.key_buffer = ""
-                    elif not self.key_buffer.startswith('\x1b'):
-                        # If not starting with ESC sequence, handle single character directly
-                        self.input_handler.handle_input(key)
-                        self.key_buffer = ""
-                    elif len(self.key_buffer) >= 3 and not self.input_handler.handle_input(self.key_buffer):
-                        # If ESC sequence with length>=3 but not handled, might be invalid sequence, clear it
-                        self.key_buffer = ""
+                    self.input_handler.handle_input(key)
+                
+                if self._refresh_pending:
+                    self._refresh_pending = False
+                    self.refresh_display(self._refresh_clear)
         
         finally:
             if has_images:
                 self.interface.restore_terminal()
     
+    def _request_refresh(self, clear_first: bool = True):
+        """Mark display for redraw once the current key has been handled"""
+        self._refresh_clear = clear_first or (self._refresh_pending and self._refresh_clear)
+        self._refresh_pending = True
+    
     def refresh_display(self, clear_first: bool = True):
         """Refresh display"""
         current_image = self.file_browser.get_current_image()
@@ -154,7 +182,7 @@ class PixelTerm:
             
             
         else:
-            print("No images found")
+            print(self.interface.text('no_images_found'))
             print()
             # Show usage help and exit
             parser = argparse.ArgumentParser(
@@ -172,6 +200,7 @@ Shortcuts:
   ←/→        Previous/Next image
   a/d        Alternative left/right keys
   i          Show/hide image information
+  h          Show keyboard shortcuts
   r          Delete current image
   q          Quit program
   Ctrl+C     Force exit
@@ -188,14 +217,14 @@ Shortcuts:
         """Next image"""
         if self.file_browser.next_image():
             self.info_displayed = False  # Reset info display state
-            self.refresh_display(clear_first=True)
+            self._request_refresh(clear_first=True)
         return True
     
     def previous_image(self):
         """Previous image"""
         if self.file_browser.previous_image():
             self.info_displayed = False  # 重置信息显示状态
-            self.refresh_display(clear_first=True)
+            self._request_refresh(clear_first=True)
         return True
     
     
@@ -203,23 +232,23 @@ Shortcuts:
     def zoom_in(self):
         """Zoom in"""
         if self.display_options.zoom_in():
-            self.refresh_display()
+            self._request_refresh()
         else:
-            self.interface.show_info("Maximum zoom level reached")
+            self.interface.show_info(self.interface.text('max_zoom'))
         return True
     
     def zoom_out(self):
         """Zoom out"""
         if self.display_options.zoom_out():
-            self.refresh_display()
+            self._request_refresh()
         else:
-            self.interface.show_info("Minimum zoom level reached")
+            self.interface.show_info(self.interface.text('min_zoom'))
         return True
     
     def reset_zoom(self):
         """Reset zoom"""
         self.display_options.reset_zoom()
-        self.refresh_display()
+        self._request_refresh()
         return True
     
     
@@ -233,7 +262,7 @@ Shortcuts:
         if self.info_displayed:
             # If info is displayed, hide info and re-render image
             self.info_displayed = False
-            self.refresh_display(clear_first=True)
+            self._request_refresh(clear_first=True)
         else:
             # Show image information
             self.interface.show_image_info(current_image, self.file_browser.get_image_count(), self.file_browser.current_index)
@@ -241,6 +270,13 @@ Shortcuts:
         
         return True
     
+    def show_help(self):
+        """Show help screen, then return to the image"""
+        self.interface.show_help()
+        self.info_displayed = False
+        self._request_refresh(clear_first=True)
+        return True
+    
     def delete_current_image(self):
         """Delete current image and jump to next"""
         current_image = self.file_browser.get_current_image()
@@ -248,26 +284,19 @@ Shortcuts:
             return True
         
         # Confirm deletion
-        with self.interface._terminal_mode_switch():
-            try:
-                print(f"\nAre you sure you want to delete image '{current_image.name}'? (y/N): ", end='', flush=True)
-                response = input().strip().lower()
-                if response != 'y' and response != 'yes':
-                    return True
-            except:
-                return True
+        if not self.interface.confirm(self.interface.text('confirm_delete', name=current_image.name)):
+            return True
         
         # Delete file
         try:
-            import os
             os.remove(current_image)
             
             # Remove from file list
-            self.file_browser.image_files.remove(current_image)
+            self.file_browser.remove_image(current_image)
             
             # If no more images after deletion, exit
             if not self.file_browser.image_files:
-                print("No more images")
+                print(self.interface.text('no_more_images'))
                 self.input_handler.stop()
                 return True
             
@@ -276,13 +305,13 @@ Shortcuts:
                 self.file_browser.current_index = 0
             
             # Refresh display
-            self.refresh_display(clear_first=True)
+            self._request_refresh(clear_first=True)
             
         except Exception as e:
             with self.interface._terminal_mode_switch():
                 try:
-                    print(f"Deletion failed: {e}")
-                    input("Press any key to continue...")
+                    print(self.interface.text('delete_failed', error=e))
+                    input(self.interface.text('press_any_key'))
                 except:
                     pass
         
@@ -291,36 +320,42 @@ Shortcuts:
     def go_up_directory(self):
         """Go up to parent directory"""
         if self.file_browser.go_up_directory():
-            self.refresh_display()
+            self._request_refresh()
         else:
-            self.interface.show_info("Already at root directory")
+            self.interface.show_info(self.interface.text('at_root'))
         return True
     
     def show_directory_list(self):
         """Show directory list"""
         subdirs = self.file_browser.get_subdirectories()
-        if subdirs:
-            self.interface.show_directory_list(subdirs)
-            dirname = self.interface.prompt_directory()
-            if dirname and dirname in subdirs:
-                if self.file_browser.enter_subdirectory(dirname):
-                    self.refresh_display()
-                else:
-                    self.interface.show_error(f"Cannot enter directory: {dirname}")
-            elif dirname:
-                self.interface.show_error(f"Directory does not exist: {dirname}")
-        else:
-            self.interface.show_info("No subdirectories in current directory")
         
-        self.refresh_display()
+        # One cooked phase for the listing, prompt and any follow-up message
+        self.interface.begin_cooked()
+        try:
+            if subdirs:
+                self.interface.show_directory_list(subdirs)
+                dirname = self.interface.prompt_directory()
+                if dirname and dirname in subdirs:
+                    if not self.file_browser.enter_subdirectory(dirname):
+                        self.interface.show_error(self.interface.text('cannot_enter_directory', name=dirname))
+                elif dirname:
+                    self.interface.show_error(self.interface.text('directory_missing', name=dirname))
+            else:
+                self.interface.show_info(self.interface.text('no_subdirectories_short'))
+        finally:
+            self.interface.end_cooked()
+        
+        self._request_refresh()
         return True
     
     
     
     def refresh(self):
         """Refresh"""
+        # Explicit refresh re-renders images that may have changed on disk
+        self.file_browser.invalidate_cache()
         self.file_browser.refresh_file_list()
-        self.refresh_display()
+        self._request_refresh()
         return True
     
     def quit(self):
@@ -331,8 +366,6 @@ Shortcuts:
 
 def main():
     """Main function"""
-    import argparse
-    
     parser = argparse.ArgumentParser(
         description='PixelTerm - Terminal Image Viewer',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -348,6 +381,7 @@ Shortcuts:
   ←/→        Previous/Next image
   a/d        Alternative left/right keys
   i          Show/hide image information
+  h          Show keyboard shortcuts
   r          Delete current image
   q          Quit program
   Ctrl+C     Force exit
@@ -374,7 +408,8 @@ Shortcuts:
         app.run()
     finally:
         # Clean up resources
-        app.file_browser.cleanup()
+        if app.file_browser is not None:
+            app.file_browser.cleanup()
 
 
 if __name__ == "__main__":